@@ -27,6 +27,8 @@ class DecisionTreeNode():
         self.decision_attribute = None
         self.label = None
         self.children = []
+        # Shared leaf for allowed values that had no examples at this node
+        self.default_child = None
 
     def pretty_print(self):
         print('|')
@@ -39,6 +41,9 @@ class DecisionTreeNode():
             for i, child in enumerate(self.children):
                 print("Branch", i, ":")
                 child.pretty_print()
+            if self.default_child is not None:
+                print("Default branch:")
+                self.default_child.pretty_print()
 
 
 def probability(examples, target):
@@ -126,16 +131,24 @@ def choose_best_attribute(examples, attributes):
     return max(gain_ratios)[1]
 
 
-# Divide the examples into subsets that correspond the each of the possible
-# values for the decision_attribute.
-# We return a list of subsets (one for each possible value), where each
+# Divide the examples into subsets that correspond the each of the
+# values for the decision_attribute that actually occur in examples.
+# We return a list of subsets (one for each value present), where each
 # subset is represented by a two-item tuple. The first item is the value,
 # and the second item is the list of examples that correspond to that
-# value.
+# value. Subsets come back in the order of the allowed values.
+# Examples are grouped in a single pass, so ID-like attributes with one
+# value per example don't rescan every example for every allowed value.
 def split_by_attribute(examples, attributes, decision_attribute):
-    return [(value, [e for e in examples
-                     if e.attributes[decision_attribute] == value])
-            for value in attributes[decision_attribute]]
+    positions = {value: i for i, value
+                 in enumerate(attributes[decision_attribute])}
+    groups = {}
+    for e in examples:
+        value = e.attributes[decision_attribute]
+        # Values outside the allowed list are dropped, as before
+        if value in positions:
+            groups.setdefault(value, []).append(e)
+    return sorted(groups.items(), key=lambda subset: positions[subset[0]])
 
 
 def id3(examples, attributes, branch_value=None):
@@ -182,18 +195,16 @@ def id3(examples, attributes, branch_value=None):
 
     new_subsets = split_by_attribute(examples, attributes, a)
     # Each subset is a tuple of decision_value and examples with that decision
-    # value
-    for i, subset in enumerate(new_subsets):
-        # Create a placeholder for each new branch
-        root.children.append(None)
-        # If there weren't any examples for this branch (no info to test
-        # against) then just give the most_common_value as a default, else
-        # build a new tree based on this subset of examples
-        if len(subset[1]) == 0:
-            root.children[i] = DecisionTreeNode(subset[0])
-            root.children[i].label = most_common_value
-        else:
-            root.children[i] = id3(subset[1], attributes_copy, subset[0])
+    # value. Only values present in examples get a subset, so build a new
+    # tree for each one.
+    for subset in new_subsets:
+        root.children.append(id3(subset[1], attributes_copy, subset[0]))
+
+    # If some allowed values had no examples (no info to test against) then
+    # they all share one leaf with the most_common_value as a default
+    if len(new_subsets) < len(attributes[a]):
+        root.default_child = DecisionTreeNode(None)
+        root.default_child.label = most_common_value
 
     return root
 
@@ -205,6 +216,8 @@ def predict(tree, example):
         for child in tree.children:
             if example.attributes[tree.decision_attribute] == child.branch_value:
                 return predict(child, example)
+        if tree.default_child is not None:
+            return predict(tree.default_child, example)
 
 
 def pprimei(p, n, pi, ni):